@@ -3,6 +3,26 @@ import numpy as np
 import pandas as pd
 import streamlit as st
 
+# NumExpr is opt-in (not in requirements); without it scores are always
+# computed with plain NumPy.
+try:
+    import numexpr as ne
+except ImportError:
+    ne = None
+
+# NumExpr's per-call overhead only pays off on larger editor tables
+NUMEXPR_MIN_ROWS = 1_000
+
+# Numba is opt-in (not in requirements); without it the greedy walk below
+# always runs as plain Python, which is plenty for typical option lists.
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# JIT dispatch/compile overhead only pays off on long option lists
+GREEDY_JIT_MIN_ROWS = 1_000
+
 # ---------------------------
 # CONFIG
 # ---------------------------
@@ -23,66 +43,120 @@ SCRIPTURE = [
     ("Philippians 4:11–12", "I have learned to be content whatever the circumstances."),
 ]
 
+@st.cache_resource(show_spinner=False)
+def scripture_md() -> tuple:
+    """Ready-to-emit markdown per verse, built once per process and shared across reruns."""
+    return tuple(f"> *“{text}”*  \n> — **{ref}**" for ref, text in SCRIPTURE)
+
+def next_verse():
+    st.session_state["dec_verse_idx"] = (st.session_state.get("dec_verse_idx", 0) + 1) % len(SCRIPTURE)
+
 def show_random_scripture():
-    ref, text = SCRIPTURE[st.session_state.get("dec_verse_idx", 0)]
-    st.markdown(f"> *“{text}”*  \n> — **{ref}**")
-    if st.button("Next Verse 🔁", key="next_verse_decision"):
-        st.session_state["dec_verse_idx"] = (st.session_state.get("dec_verse_idx", 0) + 1) % len(SCRIPTURE)
-        st.experimental_rerun()
+    st.markdown(scripture_md()[st.session_state.get("dec_verse_idx", 0)])
+    # on_click runs before the automatic rerun, so no explicit rerun is needed
+    st.button("Next Verse 🔁", key="next_verse_decision", on_click=next_verse)
 
+@st.cache_data(show_spinner=False)
 def compute_scores(df: pd.DataFrame) -> pd.DataFrame:
     """Compute value/joy per dollar scores safely."""
-    df = df.copy()
-    # Clean numeric
-    df["Cost"] = pd.to_numeric(df["Cost"], errors="coerce").fillna(0.0)
-    df["ValueScore"] = pd.to_numeric(df["ValueScore"], errors="coerce").fillna(0.0)
-    df["Joy"] = pd.to_numeric(df["Joy"], errors="coerce").fillna(0.0)
+    # Clean numeric into arrays; the input frame is not mutated (assign copies it)
+    cost = pd.to_numeric(df["Cost"], errors="coerce").fillna(0.0).to_numpy(dtype=np.float64)
+    value = pd.to_numeric(df["ValueScore"], errors="coerce").fillna(0.0).to_numpy(dtype=np.float64)
+    joy = pd.to_numeric(df["Joy"], errors="coerce").fillna(0.0).to_numpy(dtype=np.float64)
+
+    # Items without a positive cost score 0 (avoids divide-by-zero)
+    if ne is not None and len(cost) >= NUMEXPR_MIN_ROWS:
+        score = ne.evaluate("where(cost > 0, value / cost * joy, 0.0)")
+    else:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            score = np.where(cost > 0, value / cost * joy, 0.0)
+
+    return df.assign(
+        Cost=cost,
+        ValueScore=value,
+        Joy=joy,
+        Score=score,
+        Category=df["Category"].astype("category"),
+    )
 
-    # Avoid divide-by-zero
-    with np.errstate(divide="ignore", invalid="ignore"):
-        df["Score"] = (df["ValueScore"] / df["Cost"].replace(0, np.nan)) * df["Joy"]
-    df["Score"] = df["Score"].replace([np.inf, -np.inf, np.nan], 0.0)
+def _greedy(costs: np.ndarray, budget: float, spent: float):
+    """
+    Walk score-sorted costs, starting from `spent`, and take every item
+    that still fits. Returns int8 codes (0 = skip, 1 = do now, 2 = backlog)
+    and the running total spent at each chosen item (NaN elsewhere).
+    """
+    n = costs.shape[0]
+    out = np.empty(n, dtype=np.int8)
+    cum = np.full(n, np.nan)
+    for i in range(n):
+        c = costs[i]
+        if c <= 0:
+            out[i] = 0
+        elif spent + c <= budget:
+            spent += c
+            out[i] = 1
+            cum[i] = spent
+        else:
+            out[i] = 2
+    return out, cum
 
-    return df
+_greedy_jit = njit(cache=True)(_greedy) if njit is not None else None
 
-def allocate_wants(df: pd.DataFrame, wants_budget: float) -> (pd.DataFrame, pd.DataFrame):
+@st.cache_data(show_spinner=False)
+def allocate_wants(df: pd.DataFrame, wants_budget: float) -> (pd.DataFrame, pd.DataFrame, float, np.ndarray):
     """
     Given a scored options DF and a wants budget,
     greedily pick highest-score items that fit within budget.
+    Also returns the boolean do-now mask over the score-sorted rows.
     """
     df = df.sort_values("Score", ascending=False).reset_index(drop=True)
-    spent = 0.0
-    decisions = []
-
-    for _, row in df.iterrows():
-        cost = float(row["Cost"])
-        if cost <= 0:
-            decisions.append("Skip (no cost)")
-            continue
-
-        if spent + cost <= wants_budget:
-            spent += cost
-            decisions.append("✅ Do Now")
-        else:
-            decisions.append("🕒 Backlog / Wait")
 
-    df["Decision"] = decisions
-    df["CumSpentIfChosen"] = df.apply(
-        lambda r: np.nan,
-        axis=1
+    costs = df["Cost"].to_numpy(dtype=np.float64)
+    positive = costs > 0
+
+    # Every positive-cost item before the running total first exceeds the
+    # budget is guaranteed to fit, so settle that prefix in bulk.
+    running = np.cumsum(np.where(positive, costs, 0.0))
+    cutoff = int(np.searchsorted(running, wants_budget, side="right"))
+    codes = np.where(positive, 1, 0).astype(np.int8)
+    cum = np.where(positive, running, np.nan)
+
+    # Only the tail past the first overflow needs the item-by-item walk
+    if cutoff < len(costs):
+        spent_before = float(running[cutoff - 1]) if cutoff else 0.0
+        tail = costs[cutoff:]
+        walk = _greedy_jit if _greedy_jit is not None and len(tail) >= GREEDY_JIT_MIN_ROWS else _greedy
+        codes[cutoff:], cum[cutoff:] = walk(tail, float(wants_budget), spent_before)
+    do_now_mask = codes == 1
+
+    df["Decision"] = pd.Categorical.from_codes(
+        codes,
+        categories=["Skip (no cost)", "✅ Do Now", "🕒 Backlog / Wait"],
     )
-
-    # recompute cumulative spent only for "Do Now"
-    cum = 0.0
-    for i in range(len(df)):
-        if df.loc[i, "Decision"] == "✅ Do Now":
-            cum += float(df.loc[i, "Cost"])
-            df.loc[i, "CumSpentIfChosen"] = cum
-
-    do_now = df[df["Decision"] == "✅ Do Now"].copy()
-    backlog = df[df["Decision"] != "✅ Do Now"].copy()
-
-    return do_now, backlog, spent
+    df["CumSpentIfChosen"] = cum
+
+    spent = float(cum[do_now_mask][-1]) if do_now_mask.any() else 0.0
+
+    # Split on the mask we already have; iloc with positions returns new frames
+    do_now = df.iloc[np.flatnonzero(do_now_mask)]
+    backlog = df.iloc[np.flatnonzero(~do_now_mask)]
+
+    return do_now, backlog, spent, do_now_mask
+
+@st.cache_data(show_spinner=False)
+def default_options_df() -> pd.DataFrame:
+    """Seed table for the options editor (constant across reruns)."""
+    return pd.DataFrame({
+        "Name": ["Suit Supply Suit", "Suit Supply Jeans", "Uniqlo Wardrobe Refresh"],
+        # Default int64 numerics: the editor writes edits in place, and a
+        # narrow dtype (e.g. int8) would reject larger values users type in.
+        "Cost": [800, 250, 250],
+        "ValueScore": [9, 8, 7],
+        "Joy": [9, 8, 7],
+        # Kept as plain strings: a categorical here would turn the editor column
+        # into a dropdown limited to the seeded categories.
+        "Category": ["Fashion"] * 3,
+    })
 
 # ---------------------------
 # UI
@@ -146,11 +220,7 @@ st.header("2️⃣ List Your Options")
 
 st.write("Add or edit the options you’re considering. Cost is what you pay, ValueScore is how much long-term impact/usefulness you feel it has (1–10), Joy is how much it lights you up (1–10).")
 
-default_options = pd.DataFrame([
-    {"Name": "Suit Supply Suit", "Cost": 800, "ValueScore": 9, "Joy": 9, "Category": "Fashion"},
-    {"Name": "Suit Supply Jeans", "Cost": 250, "ValueScore": 8, "Joy": 8, "Category": "Fashion"},
-    {"Name": "Uniqlo Wardrobe Refresh", "Cost": 250, "ValueScore": 7, "Joy": 7, "Category": "Fashion"},
-])
+default_options = default_options_df()
 
 options_df = st.data_editor(
     default_options,
@@ -183,7 +253,7 @@ if st.button("🤖 Evaluate My Options", disabled=not can_run):
         # 1) Reserve giving & savings first (conservative style)
         giving_amount = available_amount * giving_pct / 100.0
         saving_amount = available_amount * saving_pct / 100.0
-        wants_budget = max(0.0, available_amount - giving_amount - saving_amount)
+        wants_budget = np.maximum(0.0, available_amount - giving_amount - saving_amount)
 
         st.subheader("📌 High-Level Allocation")
         g1, g2, g3, g4 = st.columns(4)
@@ -202,11 +272,13 @@ if st.button("🤖 Evaluate My Options", disabled=not can_run):
         )
 
         # 3) Allocate best options within wants budget
-        do_now, backlog, spent_now = allocate_wants(scored_df, wants_budget)
+        do_now, backlog, spent_now, do_now_mask = allocate_wants(scored_df, wants_budget)
+        has_do_now = bool(do_now_mask.any())
+        has_backlog = not do_now_mask.all()
         remaining_wants_budget = wants_budget - spent_now
 
         st.subheader("✅ Recommended to Do Now (within budget)")
-        if do_now.empty:
+        if not has_do_now:
             st.info("Based on your budget and scores, nothing clearly fits *right now*. That might be a nudge to save this round.")
         else:
             st.write(f"Total to spend now: **${spent_now:,.2f}** (of ${wants_budget:,.2f} wants budget)")
@@ -216,7 +288,7 @@ if st.button("🤖 Evaluate My Options", disabled=not can_run):
             )
 
         st.subheader("🕒 Backlog / 'Not Right Now'")
-        if backlog.empty:
+        if not has_backlog:
             st.success("No backlog — everything you listed fits within this gift and your priorities.")
         else:
             st.write("These are *good desires* to revisit later, not forgotten or forever denied.")
@@ -232,14 +304,14 @@ if st.button("🤖 Evaluate My Options", disabled=not can_run):
         summary_lines.append(f"- **Give:** about **${giving_amount:,.0f}**")
         summary_lines.append(f"- **Save/Invest:** about **${saving_amount:,.0f}**")
 
-        if not do_now.empty:
+        if has_do_now:
             buy_list = ", ".join(do_now["Name"].tolist())
             summary_lines.append(f"- **Buy now (within your 'wants' budget):** {buy_list} (total ≈ ${spent_now:,.0f})")
 
-        if remaining_wants_budget > 0 and do_now.empty:
+        if remaining_wants_budget > 0 and not has_do_now:
             summary_lines.append(f"- **You still have ≈ ${remaining_wants_budget:,.0f} of wants-budget unassigned** — you could choose to save more or wait until you’re clearer.")
 
-        if not backlog.empty:
+        if has_backlog:
             backlog_list = ", ".join(backlog["Name"].tolist())
             summary_lines.append(f"- **Backlog / Wait list:** {backlog_list} — revisit around **{wait_review_date}**.")
 